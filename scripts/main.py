@@ -14,12 +14,14 @@ import os
 import sys
 from pathlib import Path
 
-from pymongo import MongoClient
+from pymongo import InsertOne, MongoClient
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 DRY_RUN = "--dry-run" in sys.argv
+BATCH_SIZE = 1000  # max inserts sent per bulk_write
 
 
 def get_db():
@@ -28,7 +30,8 @@ def get_db():
         print("ERROR: MONGODB_URI not set in .env")
         sys.exit(1)
     db_name = os.environ.get("MONGODB_DB", "inst346_attendance")
-    client = MongoClient(uri)
+    # zlib ships with Python, so compression works without extra packages
+    client = MongoClient(uri, compressors="zlib")
     return client, client[db_name]
 
 
@@ -87,9 +90,14 @@ def backfill_attendance(date: str, uids: list[str]) -> list[str]:
     student_docs = db["students"].find({"uid": {"$in": uid_strs}}, {"uid": 1, "section": 1, "_id": 0})
     uid_to_section = {doc["uid"]: doc["section"] for doc in student_docs}
 
+    # UIDs that already have attendance for this date are skipped up front
+    present = set(db["attendance"].distinct("uid", {"date": date, "uid": {"$in": uid_strs}}))
+
     failed_uids = []
     inserted = 0
     skipped = 0
+    records = []
+    timestamp = f"{date}T12:30:00"
 
     for uid in uid_strs:
         section = uid_to_section.get(uid)
@@ -98,11 +106,16 @@ def backfill_attendance(date: str, uids: list[str]) -> list[str]:
             failed_uids.append(uid)
             continue
 
+        if uid in present:
+            print(f"  [SKIP] UID '{uid}' already has attendance for {date}")
+            skipped += 1
+            continue
+
         record = {
             "uid": uid,
             "date": date,
             "section": section,
-            "timestamp": f"{date}T12:30:00",
+            "timestamp": timestamp,
         }
 
         if DRY_RUN:
@@ -110,16 +123,27 @@ def backfill_attendance(date: str, uids: list[str]) -> list[str]:
             inserted += 1
             continue
 
+        records.append(record)
+
+    # Unordered bulk writes in fixed-size batches; duplicate-key errors only
+    # show up here if a record was added between the lookup above and now.
+    for start in range(0, len(records), BATCH_SIZE):
+        batch = records[start:start + BATCH_SIZE]
         try:
-            db["attendance"].insert_one(record)
-            inserted += 1
-        except Exception as e:
-            if "E11000" in str(e):
-                print(f"  [SKIP] UID '{uid}' already has attendance for {date}")
-                skipped += 1
-            else:
-                print(f"  [ERROR] UID '{uid}': {e}")
-                failed_uids.append(uid)
+            result = db["attendance"].bulk_write([InsertOne(r) for r in batch], ordered=False)
+            inserted += result.inserted_count
+        except BulkWriteError as bwe:
+            inserted += bwe.details["nInserted"]
+            for err in bwe.details["writeErrors"]:
+                uid = batch[err["index"]]["uid"]
+                if err["code"] == 11000:
+                    print(f"  [SKIP] UID '{uid}' already has attendance for {date}")
+                    skipped += 1
+                else:
+                    print(f"  [ERROR] UID '{uid}': {err['errmsg']}")
+                    failed_uids.append(uid)
+        if len(records) > BATCH_SIZE:
+            print(f"  ... wrote {min(start + BATCH_SIZE, len(records))}/{len(records)}")
 
     client.close()
 